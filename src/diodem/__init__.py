@@ -1,5 +1,7 @@
 from . import dataverse_github
+from . import disk_cache
 from . import utils
 from ._src import load_all_valid_motions_in_trial
 from ._src import load_data
+from ._src import load_data_async
 from ._src import load_timing_relative_to_complete_trial
@@ -0,0 +1,29 @@
+import asyncio
+from concurrent.futures import Executor
+import functools
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_in_flight: dict[Hashable, asyncio.Task] = {}
+
+
+async def run_in_executor(
+    executor: Optional[Executor], f: Callable[..., T], *args, **kwargs
+) -> T:
+    "Runs the blocking `f` in `executor` (default: the loop's executor)."
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(f, *args, **kwargs))
+
+
+async def coalesce(key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+    """Awaits `factory()`, unless a task with the same `key` is already in
+    flight on this loop, then the result of that task is awaited instead.
+    Cancelling one caller does not cancel the shared task."""
+    key = (id(asyncio.get_running_loop()), key)
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    return await asyncio.shield(task)
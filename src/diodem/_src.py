@@ -1,13 +1,19 @@
+import asyncio
+from concurrent.futures import Executor
+import copy
 from functools import cache
 from functools import wraps
-import os
+from pathlib import Path
 from typing import Optional
 
 import numpy as np
 import pandas as pd
+import tree
 import tree_utils
 
+from diodem import _aio
 from diodem import dataverse_github
+from diodem import disk_cache
 from diodem import utils
 
 
@@ -50,30 +56,36 @@ def _stack_from_df(df: pd.DataFrame, prefix: str, wxyz: str):
     return np.concatenate(arr, axis=1)
 
 
-@cache
-def _load_data(exp_id: int, motion: str, backend: str):
-    path = (
+_motion_files = ["omc.csv", "imu_rigid.csv", "imu_nonrigid.csv"]
+
+
+def _path_up_to_file(exp_id: int, motion: str, backend: str) -> str:
+    return (
         f"{_path_up_to_motion(exp_id, backend)}/{motion}/exp{str(exp_id).rjust(2, '0')}"
         f"_{motion[:8]}_"
     )
 
-    path_to_cache = os.environ.get("DIODEM_CACHE_FOLDER", "~/.diodem_cache")
-    downloader = lambda file: dataverse_github.download(
-        backend, path + file, path_to_cache
-    )
 
-    omc = pd.read_csv(downloader("omc.csv"), delimiter=",", skiprows=2)
-    omc_hz = int(open(downloader("omc.csv")).readline().split(":")[1].lstrip().rstrip())
-    imu_rigid = pd.read_csv(downloader("imu_rigid.csv"), delimiter=",", skiprows=2)
-    imu_rigid_hz = int(
-        open(downloader("imu_rigid.csv")).readline().split(":")[1].lstrip().rstrip()
-    )
-    imu_nonrigid = pd.read_csv(
-        downloader("imu_nonrigid.csv"), delimiter=",", skiprows=2
-    )
-    imu_nonrigid_hz = int(
-        open(downloader("imu_nonrigid.csv")).readline().split(":")[1].lstrip().rstrip()
-    )
+def _paths_in_repo(exp_id: int, motions: list[str], backend: str) -> list[str]:
+    return [
+        _path_up_to_file(exp_id, motion, backend) + file
+        for motion in motions
+        for file in _motion_files
+    ]
+
+
+def _read_hz(path) -> int:
+    return int(open(path).readline().split(":")[1].lstrip().rstrip())
+
+
+@cache
+def _load_data(omc_path: Path, imu_rigid_path: Path, imu_nonrigid_path: Path):
+    omc = pd.read_csv(omc_path, delimiter=",", skiprows=2)
+    omc_hz = _read_hz(omc_path)
+    imu_rigid = pd.read_csv(imu_rigid_path, delimiter=",", skiprows=2)
+    imu_rigid_hz = _read_hz(imu_rigid_path)
+    imu_nonrigid = pd.read_csv(imu_nonrigid_path, delimiter=",", skiprows=2)
+    imu_nonrigid_hz = _read_hz(imu_nonrigid_path)
     assert imu_rigid_hz == imu_nonrigid_hz
 
     data = {}
@@ -119,6 +131,31 @@ def _convert_motion(exp_id: int, motion: str | int, backend: str) -> str:
     return timing
 
 
+def _select_motions(
+    exp_id: int,
+    motion_start: str | int,
+    motion_stop: Optional[str | int],
+    backend: str,
+) -> list[str]:
+    timings = _load_timings(exp_id, backend)
+    motion_start = _convert_motion(exp_id, motion_start, backend)
+    assert motion_start in timings
+
+    if motion_stop is None:
+        motion_stop = motion_start
+    elif motion_stop == -1:
+        motion_stop = timings[-1]
+    else:
+        motion_stop = _convert_motion(exp_id, motion_stop, backend)
+        assert motion_stop in timings
+
+    motion_start_i = timings.index(motion_start)
+    motion_stop_i = timings.index(motion_stop)
+    assert motion_start_i <= motion_stop_i, "Empty sequence, stop < start"
+
+    return timings[motion_start_i : (motion_stop_i + 1)]  # noqa: E203
+
+
 def _cache_forward_docstring(f):
     return cache(wraps(f)(f))
 
@@ -159,9 +196,9 @@ def load_data(
     exp_id: int,
     motion_start: str | int = 1,
     motion_stop: Optional[str | int] = None,
-    resample_to_hz: float = 100.0,
+    resample_to_hz: Optional[float] = 100.0,
     backend: str = "github",
-) -> dict:
+) -> dict | utils.Timeseries:
     """
     Load motion capture and inertial data for a specified experiment and range of motions.
 
@@ -173,13 +210,17 @@ def load_data(
             or name (str). If None, only `motion_start` is loaded. If -1, loads until the last motion.
             Defaults to None.
         resample_to_hz (float, optional): Target sampling rate for data resampling.
-            Defaults to 100.0 Hz.
+            If None, no resampling is done and a `utils.Timeseries` with the native-rate
+            arrays is returned. Defaults to 100.0 Hz.
         backend (str, optional): The datahost backend to load the data from. Can be 'github' or 'dataverse'.
 
     Returns:
         dict: A nested dictionary containing resampled motion capture (OMC) and inertial
         measurement unit (IMU) data. Data includes quaternion, marker positions,
         and accelerometer, gyroscope, and magnetometer readings for each segment.
+        If `resample_to_hz` is None, a `utils.Timeseries`, i.e. the same nested
+        dictionary at native rates that also provides its time bases (`.ts`) and
+        evaluates it at arbitrary times in seconds (`.at(ts)`).
 
     Raises:
         AssertionError: If `motion_start` or `motion_stop` are invalid or if
@@ -193,43 +234,122 @@ def load_data(
             - IMU data (`imu_rigid` and `imu_nonrigid`) for acceleration (`acc`),
               gyroscope (`gyr`), and magnetometer (`mag`).
         - Data is resampled to match the specified `resample_to_hz` frequency.
+          If `resample_to_hz` is None, data stays at the native IMU and OMC rates.
         - The location where data is stored can be modified by setting the env variable DIODEM_CACHE_FOLDER (default: ~/.diodem_cache).
+        - The size of this cache can be bounded by setting the env variable DIODEM_CACHE_QUOTA (e.g. `5G`), least-recently-used files are evicted first.
+          The cache folder can be shared by several processes (the index is protected by a file lock, not on Windows). Files that another process evicts while they are loaded are downloaded again.
     """  # noqa: E501
-    timings = _load_timings(exp_id, backend)
-    motion_start = _convert_motion(exp_id, motion_start, backend)
-    assert motion_start in timings
-
-    if motion_stop is None:
-        motion_stop = motion_start
-    elif motion_stop == -1:
-        motion_stop = timings[-1]
-    else:
-        motion_stop = _convert_motion(exp_id, motion_stop, backend)
-        assert motion_stop in timings
-
-    motion_start_i = timings.index(motion_start)
-    motion_stop_i = timings.index(motion_stop)
-    assert motion_start_i <= motion_stop_i, "Empty sequence, stop < start"
-
-    motions = timings[motion_start_i : (motion_stop_i + 1)]  # noqa: E203
+    motions = _select_motions(exp_id, motion_start, motion_stop, backend)
+    paths = _paths_in_repo(exp_id, motions, backend)
+    path_to_cache = disk_cache.cache_folder()
+    with disk_cache.pin(path_to_cache, paths):
+        files = [
+            dataverse_github.download(backend, path, path_to_cache) for path in paths
+        ]
+        return _load_motions_or_redownload(
+            files, paths, backend, path_to_cache, resample_to_hz
+        )
+
+
+def _load_motions_or_redownload(
+    files: list[Path],
+    paths: list[str],
+    backend: str,
+    path_to_cache: Path,
+    resample_to_hz: Optional[float],
+) -> dict | utils.Timeseries:
+    try:
+        return _load_motions(files, resample_to_hz)
+    except FileNotFoundError:
+        # pins only hold within this process, another process that shares the
+        # cache folder may have evicted a file since it was downloaded
+        files = [
+            dataverse_github.download(backend, path, path_to_cache) for path in paths
+        ]
+        return _load_motions(files, resample_to_hz)
+
+
+def _load_motions(
+    files: list[Path], resample_to_hz: Optional[float]
+) -> dict | utils.Timeseries:
+    "Parses and resamples the downloaded `_motion_files` of consecutive motions."
     data = []
-    for motion in motions:
-        data_motion, hz_omc, hz_imu = _load_data(exp_id, motion, backend)
+    n = len(_motion_files)
+    for i in range(0, len(files), n):
+        data_motion, hz_omc, hz_imu = _load_data(*files[i : i + n])  # noqa: E203
         data.append(data_motion)
 
     data = tree_utils.tree_batch(data, along_existing_first_axis=True, backend="numpy")
+    hz_in = utils.hz_helper(
+        data.keys(),
+        imus=["imu_rigid", "imu_nonrigid"],
+        hz_imu=hz_imu,
+        hz_omc=hz_omc,
+    )
+
+    if resample_to_hz is None:
+        # for a single motion `tree_batch` does not copy, and the arrays of the
+        # cached `_load_data` must not be exposed
+        data = tree.map_structure(np.copy, data)
+        return utils.Timeseries(data, hz_in, vecinterp_method="cubic")
 
     data = utils.resample(
         data,
-        hz_in=utils.hz_helper(
-            data.keys(),
-            imus=["imu_rigid", "imu_nonrigid"],
-            hz_imu=hz_imu,
-            hz_omc=hz_omc,
-        ),
+        hz_in=hz_in,
         hz_out=resample_to_hz,
         vecinterp_method="cubic",
     )
     data = utils.crop_tail(data, resample_to_hz, strict=True, verbose=False)
 
     return data
+
+
+async def load_data_async(
+    exp_id: int,
+    motion_start: str | int = 1,
+    motion_stop: Optional[str | int] = None,
+    resample_to_hz: Optional[float] = 100.0,
+    backend: str = "github",
+    executor: Optional[Executor] = None,
+) -> dict | utils.Timeseries:
+    """Like `load_data` but does not block the event loop. The files of all motions
+    are downloaded concurrently, parsing and resampling run in `executor` (default:
+    the loop's default executor). Concurrent calls that load the same motions are
+    coalesced into a single load, every caller gets its own copy of the data."""
+    # the timings are listed from the datahost only once, afterwards they are cached
+    await _aio.coalesce(
+        ("load_timings", exp_id, backend),
+        lambda: _aio.run_in_executor(executor, _load_timings, exp_id, backend),
+    )
+    motions = await _aio.run_in_executor(
+        executor, _select_motions, exp_id, motion_start, motion_stop, backend
+    )
+    key = ("load_data", exp_id, tuple(motions), resample_to_hz, backend)
+    data = await _aio.coalesce(
+        key,
+        lambda: _load_data_async(exp_id, motions, resample_to_hz, backend, executor),
+    )
+    return await _aio.run_in_executor(executor, copy.deepcopy, data)
+
+
+async def _load_data_async(exp_id, motions, resample_to_hz, backend, executor):
+    paths = await _aio.run_in_executor(
+        executor, _paths_in_repo, exp_id, motions, backend
+    )
+    path_to_cache = disk_cache.cache_folder()
+    with disk_cache.pin(path_to_cache, paths):
+        files = await asyncio.gather(
+            *[
+                dataverse_github.download_async(backend, path, path_to_cache, executor)
+                for path in paths
+            ]
+        )
+        return await _aio.run_in_executor(
+            executor,
+            _load_motions_or_redownload,
+            files,
+            paths,
+            backend,
+            path_to_cache,
+            resample_to_hz,
+        )
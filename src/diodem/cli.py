@@ -0,0 +1,97 @@
+import argparse
+from typing import Optional
+
+from diodem import disk_cache
+
+
+def _cache_info(args) -> int:
+    cached = disk_cache.entries(args.cache_folder)
+    total = sum(ele.size for ele in cached)
+    quota = disk_cache.quota()
+    print(f"Cache folder: {args.cache_folder}")
+    print(f"Files: {len(cached)}")
+    print(
+        f"Size: {disk_cache.format_size(total)}"
+        + ("" if quota is None else f" (quota: {disk_cache.format_size(quota)})")
+    )
+    if args.verbose:
+        for ele in reversed(cached):
+            print(f"  {disk_cache.format_size(ele.size):>10}  {ele.path}")
+    return 0
+
+
+def _cache_prune(args) -> int:
+    if args.quota is not None:
+        max_bytes = disk_cache.parse_size(args.quota)
+    else:
+        max_bytes = disk_cache.quota()
+    if max_bytes is None:
+        print("No quota given, use `--quota` or set env variable DIODEM_CACHE_QUOTA.")
+        return 1
+
+    evicted = disk_cache.prune(args.cache_folder, max_bytes)
+    for path in evicted:
+        print(f"Evicted {path}")
+    print(f"Evicted {len(evicted)} file(s).")
+    return 0
+
+
+def _cache_verify(args) -> int:
+    report = disk_cache.verify(args.cache_folder, fix=args.fix)
+    for problem, paths in report.items():
+        for path in paths:
+            print(f"{problem}: {path}")
+    # untracked files are fine, they are only not yet known to the index
+    n_problems = len(report["missing"]) + len(report["corrupted"])
+    if n_problems == 0:
+        print("Cache is consistent.")
+        return 0
+    if args.fix:
+        print(f"Fixed {n_problems} problem(s).")
+        return 0
+    print(f"Found {n_problems} problem(s), run with `--fix` to repair the index.")
+    return 1
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="diodem")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    cache = subparsers.add_parser("cache", help="Manage the on-disk data cache.")
+    cache.add_argument(
+        "--cache-folder",
+        default=disk_cache.cache_folder(),
+        help="Defaults to env variable DIODEM_CACHE_FOLDER or ~/.diodem_cache",
+    )
+    cache_subparsers = cache.add_subparsers(dest="cache_command", required=True)
+
+    info = cache_subparsers.add_parser("info", help="Show size of the cache.")
+    info.add_argument("-v", "--verbose", action="store_true", help="List all files.")
+    info.set_defaults(func=_cache_info)
+
+    prune = cache_subparsers.add_parser(
+        "prune", help="Evict least-recently-used files until under quota."
+    )
+    prune.add_argument(
+        "--quota",
+        default=None,
+        help="E.g. `5G`. Defaults to env variable DIODEM_CACHE_QUOTA.",
+    )
+    prune.set_defaults(func=_cache_prune)
+
+    verify = cache_subparsers.add_parser(
+        "verify", help="Check cached files against the index."
+    )
+    verify.add_argument(
+        "--fix",
+        action="store_true",
+        help="Delete corrupted files and rebuild the index.",
+    )
+    verify.set_defaults(func=_cache_verify)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,16 @@
+import pytest
+
+from diodem import disk_cache
+
+
+@pytest.fixture
+def write_to_cache():
+    "Writes a file of `size` bytes into the cache as if it was just downloaded."
+
+    def write(path_to_cache, path_in_repo: str, size: int):
+        path_on_disk = path_to_cache.joinpath(path_in_repo)
+        path_on_disk.parent.mkdir(parents=True, exist_ok=True)
+        path_on_disk.write_bytes(b"0" * size)
+        disk_cache.touch(path_to_cache, path_in_repo, downloaded=True)
+
+    return write
@@ -1,3 +1,4 @@
+from concurrent.futures import Executor
 from functools import cache
 import json
 from pathlib import Path
@@ -5,6 +6,9 @@ from typing import NamedTuple, Optional
 
 import requests
 
+from diodem import _aio
+from diodem import disk_cache
+
 NotValidDataHost = Exception(
     "Possible options for `backend` are 'github' or 'dataverse'"
 )
@@ -39,29 +43,53 @@ def listdir(
 def download(
     backend: str,
     path_in_repo: str,
-    path_to_cache: str,
+    path_to_cache: str | Path,
 ) -> Path:
     "Download file from Github/Dataverse repo. Returns path on disk."
     path_on_disk = Path(path_to_cache).expanduser().joinpath(path_in_repo)
-    if not path_on_disk.exists():
-        path_on_disk.parent.mkdir(parents=True, exist_ok=True)
-
-        if backend == "github":
-            url = _url_github(path_in_repo)
-        elif backend == "dataverse":
-            url = _url_dataverse(path_in_repo)
+    # pin before checking the existence, such that no other thread evicts the file
+    with disk_cache.pin(path_to_cache, [path_in_repo]):
+        if not path_on_disk.exists():
+            path_on_disk.parent.mkdir(parents=True, exist_ok=True)
+
+            if backend == "github":
+                url = _url_github(path_in_repo)
+            elif backend == "dataverse":
+                url = _url_dataverse(path_in_repo)
+            else:
+                raise NotValidDataHost
+
+            print(f"Downloading file from url {url}.. (this might take a moment)")
+            _wget(url, out=str(path_on_disk))
+            print(
+                f"Downloading finished. Saved to location {path_on_disk}. "
+                "The size of the cache can be bounded by setting the env variable "
+                "DIODEM_CACHE_QUOTA (e.g. `5G`) or by running `diodem cache prune`."
+            )
+            disk_cache.touch(path_to_cache, path_in_repo, downloaded=True)
+            disk_cache.enforce_quota(path_to_cache)
         else:
-            raise NotValidDataHost
-
-        print(f"Downloading file from url {url}.. (this might take a moment)")
-        _wget(url, out=str(path_on_disk))
-        print(
-            f"Downloading finished. Saved to location {path_on_disk}. "
-            f"All downloaded files can be deleted by removing folder {path_to_cache}."
-        )
+            disk_cache.touch(path_to_cache, path_in_repo)
     return path_on_disk
 
 
+async def download_async(
+    backend: str,
+    path_in_repo: str,
+    path_to_cache: str | Path,
+    executor: Optional[Executor] = None,
+) -> Path:
+    """Like `download` but does not block the event loop. Concurrent downloads of
+    the same file are coalesced into a single download."""
+    key = ("download", backend, path_in_repo, str(Path(path_to_cache).expanduser()))
+    return await _aio.coalesce(
+        key,
+        lambda: _aio.run_in_executor(
+            executor, download, backend, path_in_repo, path_to_cache
+        ),
+    )
+
+
 class DataverseFile(NamedTuple):
     path: str
     id: int
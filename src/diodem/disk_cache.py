@@ -0,0 +1,295 @@
+from collections import Counter
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import re
+import threading
+import time
+from typing import NamedTuple, Optional
+import warnings
+
+try:
+    import fcntl
+except ImportError:
+    # not available on Windows, there the lock only works within one process
+    fcntl = None
+
+_index_filename = ".diodem_cache_index.json"
+_size_suffixes = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+# guards the read-modify-write of the index when downloading from several threads,
+# across processes that share the cache folder a file lock is taken in addition
+_index_lock = threading.RLock()
+_index_lock_depth = 0
+# files that are in use by this process, these are never evicted; the pins have
+# their own lock as the index lock might be held for a long time during `prune`
+_pinned: Counter[tuple[str, str]] = Counter()
+_pinned_lock = threading.Lock()
+
+
+class CacheEntry(NamedTuple):
+    path: str
+    size: int
+    last_access: float
+
+
+def cache_folder() -> Path:
+    "Location of the on-disk cache, can be set with env variable DIODEM_CACHE_FOLDER."
+    return Path(os.environ.get("DIODEM_CACHE_FOLDER", "~/.diodem_cache")).expanduser()
+
+
+def parse_size(size: str | int) -> int:
+    "Parses a number of bytes, e.g. `1024`, `500M` or `2.5G`."
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([KMGT]?)I?B?\s*", size.upper())
+    if match is None:
+        raise ValueError(f"Could not parse `{size}` as a size in bytes.")
+    return int(float(match.group(1)) * _size_suffixes[match.group(2)])
+
+
+def format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    for suffix in ["KiB", "MiB", "GiB", "TiB"]:
+        size /= 1024
+        if size < 1024 or suffix == "TiB":
+            return f"{size:.1f} {suffix}"
+
+
+def quota() -> Optional[int]:
+    """Byte quota of the on-disk cache, can be set with env variable
+    DIODEM_CACHE_QUOTA (e.g. `5G`). Returns None if the cache is unbounded."""
+    value = os.environ.get("DIODEM_CACHE_QUOTA")
+    if value is None or value.strip() == "":
+        return None
+    try:
+        return parse_size(value)
+    except ValueError:
+        warnings.warn(
+            f"Could not parse env variable DIODEM_CACHE_QUOTA=`{value}` as a size "
+            "in bytes (e.g. `5G`), the cache is unbounded."
+        )
+        return None
+
+
+def _index_path(path_to_cache: str | Path) -> Path:
+    return Path(path_to_cache).expanduser().joinpath(_index_filename)
+
+
+@contextmanager
+def _locked(path_to_cache: str | Path):
+    global _index_lock_depth
+    with _index_lock:
+        lockfile = None
+        if _index_lock_depth == 0 and fcntl is not None:
+            root = Path(path_to_cache).expanduser()
+            root.mkdir(parents=True, exist_ok=True)
+            lockfile = open(root.joinpath(_index_filename + ".lock"), "a")
+            fcntl.flock(lockfile, fcntl.LOCK_EX)
+        _index_lock_depth += 1
+        try:
+            yield
+        finally:
+            _index_lock_depth -= 1
+            if lockfile is not None:
+                # closing the file releases the lock
+                lockfile.close()
+
+
+def _load_index(path_to_cache: str | Path) -> dict[str, dict]:
+    path_index = _index_path(path_to_cache)
+    if not path_index.exists():
+        return {}
+    try:
+        return json.load(open(path_index))
+    except json.JSONDecodeError:
+        # a corrupted index only loses access times, it is rebuilt by `verify`
+        return {}
+
+
+def _save_index(path_to_cache: str | Path, index: dict[str, dict]) -> None:
+    path_index = _index_path(path_to_cache)
+    path_index.parent.mkdir(parents=True, exist_ok=True)
+    path_tmp = path_index.with_name(
+        f"{path_index.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    with open(path_tmp, "w") as f:
+        json.dump(index, f)
+    os.replace(path_tmp, path_index)
+
+
+def _files_on_disk(path_to_cache: str | Path) -> list[str]:
+    root = Path(path_to_cache).expanduser()
+    if not root.exists():
+        return []
+    return sorted(
+        file.relative_to(root).as_posix()
+        for file in root.rglob("*")
+        if file.is_file() and not file.name.startswith(_index_filename)
+    )
+
+
+def touch(path_to_cache: str | Path, path_in_repo: str, downloaded: bool = False):
+    """Records that the file `path_in_repo` in the cache has just been accessed.
+    If `downloaded`, also records its size which `verify` compares against."""
+    path_on_disk = Path(path_to_cache).expanduser().joinpath(path_in_repo)
+    with _locked(path_to_cache):
+        index = _load_index(path_to_cache)
+        entry = index.setdefault(path_in_repo, {})
+        entry["last_access"] = time.time()
+        if downloaded:
+            entry["size"] = path_on_disk.stat().st_size
+        _save_index(path_to_cache, index)
+
+
+def entries(path_to_cache: str | Path) -> list[CacheEntry]:
+    """Returns all files in the cache, least-recently-used first. Files that
+    are not tracked in the index are considered to be accessed last at their
+    modification time."""
+    root = Path(path_to_cache).expanduser()
+    index = _load_index(path_to_cache)
+    result = []
+    for file in _files_on_disk(path_to_cache):
+        stat = root.joinpath(file).stat()
+        last_access = index.get(file, {}).get("last_access", stat.st_mtime)
+        result.append(CacheEntry(file, stat.st_size, last_access))
+    result.sort(key=lambda ele: ele.last_access)
+    return result
+
+
+@contextmanager
+def pin(path_to_cache: str | Path, paths_in_repo: list[str]):
+    "Files in `paths_in_repo` are not evicted while inside this context."
+    root = str(Path(path_to_cache).expanduser())
+    keys = [(root, path) for path in paths_in_repo]
+    with _pinned_lock:
+        _pinned.update(keys)
+    try:
+        yield
+    finally:
+        with _pinned_lock:
+            _pinned.subtract(keys)
+            for key in keys:
+                if _pinned[key] <= 0:
+                    del _pinned[key]
+
+
+def _derived_from(path: str, other: str) -> bool:
+    return other.startswith(path + ".")
+
+
+def _remove(path_to_cache: str | Path, path_in_repo: str) -> bool:
+    "Removes the file unless it is pinned. Returns whether it was removed."
+    root = Path(path_to_cache).expanduser()
+    path_on_disk = root.joinpath(path_in_repo)
+    # checking the pins and removing must be atomic, otherwise a file could be
+    # removed right after it was pinned and found to exist by `download`
+    with _pinned_lock:
+        if (str(root), path_in_repo) in _pinned:
+            return False
+        path_on_disk.unlink(missing_ok=True)
+        # remove now empty folders but never the cache folder itself, nor
+        # folders into which a pinned file is about to be downloaded
+        pinned = [root.joinpath(path) for r, path in _pinned if r == str(root)]
+        parent = path_on_disk.parent
+        while parent != root and parent.exists() and not any(parent.iterdir()):
+            if any(parent in path.parents for path in pinned):
+                break
+            parent.rmdir()
+            parent = parent.parent
+    return True
+
+
+def prune(
+    path_to_cache: str | Path,
+    max_bytes: int,
+    keep: tuple[str, ...] = (),
+) -> list[str]:
+    """Evicts least-recently-used files (together with files derived from them,
+    i.e. `<file>.*`) until the cache is at most `max_bytes` large. Files in
+    `keep` and files that are pinned are never evicted. Returns the list of
+    evicted files."""
+    with _locked(path_to_cache):
+        return _prune(path_to_cache, max_bytes, keep)
+
+
+def _prune(path_to_cache: str | Path, max_bytes: int, keep: tuple[str, ...]):
+    cached = entries(path_to_cache)
+    total = sum(ele.size for ele in cached)
+    sizes = {ele.path: ele.size for ele in cached}
+
+    evicted = []
+    for ele in cached:
+        if total <= max_bytes:
+            break
+        if ele.path in evicted or ele.path in keep:
+            continue
+        if any(_derived_from(ele.path, path) for path in keep):
+            continue
+        for path in [ele.path] + [p for p in sizes if _derived_from(ele.path, p)]:
+            if path in evicted:
+                continue
+            if not _remove(path_to_cache, path):
+                # the file is in use, keep the files derived from it as well
+                break
+            total -= sizes[path]
+            evicted.append(path)
+
+    if len(evicted) > 0:
+        index = _load_index(path_to_cache)
+        for path in evicted:
+            index.pop(path, None)
+        _save_index(path_to_cache, index)
+
+    return evicted
+
+
+def enforce_quota(path_to_cache: str | Path, keep: tuple[str, ...] = ()) -> list[str]:
+    "Prunes the cache to `quota()`, if a quota is set."
+    max_bytes = quota()
+    if max_bytes is None:
+        return []
+    return prune(path_to_cache, max_bytes, keep=keep)
+
+
+def verify(path_to_cache: str | Path, fix: bool = False) -> dict[str, list[str]]:
+    """Compares the index with the files on disk. Returns the files that are
+    `missing` on disk, `corrupted` (empty or size differs from the index) and
+    `untracked` by the index (e.g. downloaded before the index existed, this is
+    not a problem). If `fix`, corrupted files that are not pinned are deleted
+    (such that they are re-downloaded on next access) and the index is rebuilt."""
+    with _locked(path_to_cache):
+        return _verify(path_to_cache, fix)
+
+
+def _verify(path_to_cache: str | Path, fix: bool) -> dict[str, list[str]]:
+    index = _load_index(path_to_cache)
+    root = Path(path_to_cache).expanduser()
+    on_disk = set(_files_on_disk(path_to_cache))
+
+    report = dict(missing=[], corrupted=[], untracked=[])
+    for path in index:
+        if path not in on_disk:
+            report["missing"].append(path)
+    for path in sorted(on_disk):
+        size = root.joinpath(path).stat().st_size
+        tracked = "size" in index.get(path, {})
+        if size == 0 or (tracked and index[path]["size"] != size):
+            report["corrupted"].append(path)
+        elif not tracked:
+            report["untracked"].append(path)
+
+    if fix:
+        for path in report["corrupted"]:
+            if _remove(path_to_cache, path):
+                index.pop(path, None)
+        for path in report["missing"]:
+            index.pop(path, None)
+        for path in report["untracked"]:
+            stat = root.joinpath(path).stat()
+            entry = index.setdefault(path, dict(last_access=stat.st_mtime))
+            entry["size"] = stat.st_size
+        _save_index(path_to_cache, index)
+
+    return report
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from diodem import _aio
+
+
+def test_coalesce():
+    calls = []
+
+    async def load(x):
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        return [x]
+
+    async def main():
+        results = await asyncio.gather(
+            *[_aio.coalesce(("load", 1), lambda: load(1)) for _ in range(5)],
+            _aio.coalesce(("load", 2), lambda: load(2)),
+        )
+        # once finished, the task is not coalesced anymore
+        results.append(await _aio.coalesce(("load", 1), lambda: load(1)))
+        return results
+
+    results = asyncio.run(main())
+    assert calls == [1, 2, 1]
+    assert all(result is results[0] for result in results[:5])
+    assert results[5] == [2]
+    assert results[6] is not results[0]
+    assert _aio._in_flight == {}
+
+
+def test_coalesce_cancel():
+    async def load():
+        await asyncio.sleep(0.01)
+        return 1
+
+    async def main():
+        first = asyncio.ensure_future(_aio.coalesce("load", load))
+        second = asyncio.ensure_future(_aio.coalesce("load", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # cancelling one caller does not cancel the shared task
+        return await second
+
+    assert asyncio.run(main()) == 1
@@ -0,0 +1,43 @@
+from diodem import disk_cache
+from diodem.cli import main
+
+
+def test_cache_info(tmp_path, capsys, write_to_cache):
+    write_to_cache(tmp_path, "a/omc.csv", 100)
+    assert main(["cache", "--cache-folder", str(tmp_path), "info", "-v"]) == 0
+    out = capsys.readouterr().out
+    assert "Files: 1" in out and "a/omc.csv" in out
+
+
+def test_cache_prune(tmp_path, monkeypatch, write_to_cache):
+    write_to_cache(tmp_path, "a.csv", 100)
+    write_to_cache(tmp_path, "b.csv", 100)
+
+    # no quota given
+    monkeypatch.delenv("DIODEM_CACHE_QUOTA", raising=False)
+    assert main(["cache", "--cache-folder", str(tmp_path), "prune"]) == 1
+
+    assert (
+        main(["cache", "--cache-folder", str(tmp_path), "prune", "--quota", "150"]) == 0
+    )
+    assert [ele.path for ele in disk_cache.entries(tmp_path)] == ["b.csv"]
+
+    monkeypatch.setenv("DIODEM_CACHE_QUOTA", "0")
+    assert main(["cache", "--cache-folder", str(tmp_path), "prune"]) == 0
+    assert disk_cache.entries(tmp_path) == []
+
+
+def test_cache_verify(tmp_path, write_to_cache):
+    cache = ["cache", "--cache-folder", str(tmp_path)]
+    write_to_cache(tmp_path, "a.csv", 100)
+    assert main(cache + ["verify"]) == 0
+
+    # untracked files, e.g. from before the index existed, are no problem
+    tmp_path.joinpath("b.csv").write_bytes(b"0" * 10)
+    assert main(cache + ["verify"]) == 0
+
+    tmp_path.joinpath("a.csv").write_bytes(b"0" * 10)
+    assert main(cache + ["verify"]) == 1
+    assert main(cache + ["verify", "--fix"]) == 0
+    assert main(cache + ["verify"]) == 0
+    assert disk_cache.verify(tmp_path) == dict(missing=[], corrupted=[], untracked=[])
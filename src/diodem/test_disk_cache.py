@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+
+import pytest
+
+from diodem import disk_cache
+
+
+def test_parse_size():
+    assert disk_cache.parse_size(10) == 10
+    assert disk_cache.parse_size("10") == 10
+    assert disk_cache.parse_size("2K") == 2048
+    assert disk_cache.parse_size("1.5G") == int(1.5 * 1024**3)
+    assert disk_cache.parse_size("500MiB") == 500 * 1024**2
+
+
+def test_prune_lru(tmp_path, write_to_cache):
+    write_to_cache(tmp_path, "b/omc.csv", 100)
+    write_to_cache(tmp_path, "c/omc.csv", 100)
+    write_to_cache(tmp_path, "a/omc.csv", 100)
+    write_to_cache(tmp_path, "a/omc.csv.npz", 50)
+
+    evicted = disk_cache.prune(tmp_path, 300)
+    assert evicted == ["b/omc.csv"]
+    assert not tmp_path.joinpath("b").exists()
+
+    # evicting a file also evicts files derived from it
+    evicted = disk_cache.prune(tmp_path, 100, keep=("c/omc.csv",))
+    assert evicted == ["a/omc.csv", "a/omc.csv.npz"]
+    assert [ele.path for ele in disk_cache.entries(tmp_path)] == ["c/omc.csv"]
+
+
+def test_pin(tmp_path, write_to_cache):
+    write_to_cache(tmp_path, "a/omc.csv", 100)
+    write_to_cache(tmp_path, "b/omc.csv", 100)
+
+    with disk_cache.pin(tmp_path, ["a/omc.csv", "c/omc.csv"]):
+        assert disk_cache.prune(tmp_path, 0) == ["b/omc.csv"]
+    assert disk_cache._pinned == {}
+    assert disk_cache.prune(tmp_path, 0) == ["a/omc.csv"]
+
+
+def test_enforce_quota(tmp_path, monkeypatch, write_to_cache):
+    write_to_cache(tmp_path, "a.csv", 100)
+    write_to_cache(tmp_path, "b.csv", 100)
+
+    monkeypatch.delenv("DIODEM_CACHE_QUOTA", raising=False)
+    assert disk_cache.enforce_quota(tmp_path) == []
+
+    # invalid quota warns and leaves the cache unbounded
+    monkeypatch.setenv("DIODEM_CACHE_QUOTA", "5GBs")
+    with pytest.warns(UserWarning, match="DIODEM_CACHE_QUOTA"):
+        assert disk_cache.enforce_quota(tmp_path) == []
+
+    monkeypatch.setenv("DIODEM_CACHE_QUOTA", "150")
+    assert disk_cache.enforce_quota(tmp_path, keep=("a.csv",)) == ["b.csv"]
+
+
+def test_verify(tmp_path, write_to_cache):
+    write_to_cache(tmp_path, "a.csv", 100)
+    write_to_cache(tmp_path, "b.csv", 100)
+    write_to_cache(tmp_path, "c.csv", 100)
+    os.remove(tmp_path.joinpath("a.csv"))
+    tmp_path.joinpath("b.csv").write_bytes(b"0" * 10)
+    tmp_path.joinpath("d.csv").write_bytes(b"0" * 10)
+
+    report = disk_cache.verify(tmp_path)
+    assert report == dict(missing=["a.csv"], corrupted=["b.csv"], untracked=["d.csv"])
+
+    disk_cache.verify(tmp_path, fix=True)
+    assert not tmp_path.joinpath("b.csv").exists()
+    assert disk_cache.verify(tmp_path) == dict(missing=[], corrupted=[], untracked=[])
+
+
+def test_touch_keeps_size(tmp_path, write_to_cache):
+    write_to_cache(tmp_path, "a.csv", 100)
+    tmp_path.joinpath("a.csv").write_bytes(b"0" * 10)
+
+    # accessing a corrupted file does not make it consistent
+    disk_cache.touch(tmp_path, "a.csv")
+    assert disk_cache.verify(tmp_path)["corrupted"] == ["a.csv"]
+
+    # files that were only accessed but never downloaded are untracked
+    tmp_path.joinpath("b.csv").write_bytes(b"0" * 10)
+    disk_cache.touch(tmp_path, "b.csv")
+    assert disk_cache.verify(tmp_path)["untracked"] == ["b.csv"]
+
+
+def test_verify_skips_pinned(tmp_path, write_to_cache):
+    write_to_cache(tmp_path, "a.csv", 100)
+    tmp_path.joinpath("a.csv").write_bytes(b"0" * 10)
+
+    with disk_cache.pin(tmp_path, ["a.csv"]):
+        disk_cache.verify(tmp_path, fix=True)
+        assert tmp_path.joinpath("a.csv").exists()
+    disk_cache.verify(tmp_path, fix=True)
+    assert not tmp_path.joinpath("a.csv").exists()
+
+
+def _touch_many(path_to_cache, prefix: str):
+    for i in range(20):
+        disk_cache.touch(path_to_cache, f"{prefix}{i}.csv", downloaded=True)
+
+
+@pytest.mark.skipif(disk_cache.fcntl is None, reason="no file lock on this platform")
+def test_index_across_processes(tmp_path):
+    for prefix in "abcd":
+        for i in range(20):
+            tmp_path.joinpath(f"{prefix}{i}.csv").write_bytes(b"0")
+
+    ctx = multiprocessing.get_context("fork")
+    processes = [
+        ctx.Process(target=_touch_many, args=(tmp_path, prefix)) for prefix in "abcd"
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    # no index update was lost
+    assert len(disk_cache._load_index(tmp_path)) == 80
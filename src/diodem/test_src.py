@@ -1,7 +1,14 @@
+import asyncio
+import time
+
+import numpy as np
 import pytest
 
+from diodem import _src
+from diodem import dataverse_github
 from diodem import load_all_valid_motions_in_trial
 from diodem import load_data
+from diodem import load_data_async
 from diodem import load_timing_relative_to_complete_trial
 
 
@@ -45,3 +52,65 @@ def test_load_motions():
 
 def test_load_timings():
     load_timing_relative_to_complete_trial(1, "slow1")
+
+
+def test_load_data_async():
+    motion1 = load_all_valid_motions_in_trial(1)[0]
+
+    async def main():
+        return await asyncio.gather(
+            load_data_async(1, "pause1", "pause2"),
+            load_data_async(1, "pause1", "pause2"),
+            load_data_async(1, 1),
+            load_data_async(1, motion1),
+        )
+
+    data1, data2, data3, data4 = asyncio.run(main())
+    np.testing.assert_array_equal(data1["seg1"]["quat"], data2["seg1"]["quat"])
+    np.testing.assert_array_equal(data3["seg1"]["quat"], data4["seg1"]["quat"])
+
+    # every caller gets its own copy
+    data1["seg1"]["quat"][:] = -5.0
+    assert not np.all(data2["seg1"]["quat"] == -5.0)
+
+
+def test_native_rate_is_copy():
+    data = load_data(1, 1, resample_to_hz=None)
+    data["seg1"]["marker1"][:] = -5.0
+    assert not np.all(load_data(1, 1, resample_to_hz=None)["seg1"]["marker1"] == -5.0)
+    assert not np.all(load_data(1, 1)["seg1"]["marker1"] == -5.0)
+
+
+def test_load_data_async_lists_timings_once(monkeypatch):
+    files = [
+        f"dataset/arm/exp99/{motion}/exp99_{motion[:8]}_omc.csv"
+        for motion in ["motion01_canonical", "motion02_pause1"]
+    ]
+    calls = []
+
+    def listdir_github():
+        calls.append(1)
+        time.sleep(0.05)  # network latency
+        return files
+
+    async def load(exp_id, motions, resample_to_hz, backend, executor):
+        return {"motions": list(motions)}
+
+    monkeypatch.setattr(dataverse_github, "_listdir_github", listdir_github)
+    monkeypatch.setattr(_src, "_load_data_async", load)
+    _src._is_arm_or_gait.cache_clear()
+    _src._load_timings.cache_clear()
+
+    async def main():
+        return await asyncio.gather(
+            *[load_data_async(99, "pause1") for _ in range(10)],
+            *[load_data_async(99, 2) for _ in range(10)],
+        )
+
+    results = asyncio.run(main())
+    _src._is_arm_or_gait.cache_clear()
+    _src._load_timings.cache_clear()
+
+    assert all(result == {"motions": ["motion02_pause1"]} for result in results)
+    # listed once to find the `arm` folder and once to find the motions
+    assert len(calls) == 2
@@ -1,5 +1,7 @@
 import numpy as np
+import pytest
 import qmt
+import tree
 
 from diodem import utils
 
@@ -98,3 +100,60 @@ def test_resample_and_crop_tail():
     np.testing.assert_allclose(
         data_cropped["omc"][:-2], np.arange(100.0, step=1 / 2.5)[:-2]
     )
+
+
+def test_timeseries():
+    signal = {
+        "gyr": np.sin(np.arange(100.0) / 10),
+        "omc": {
+            "marker": np.random.default_rng(1).normal(size=(300, 3)),
+            "quat": quatfromangles(np.arange(300) / 30),
+        },
+    }
+    hz = {"gyr": 40.0, "omc": {"marker": 120.0, "quat": 120.0}}
+    data = utils.Timeseries(signal, hz)
+
+    # native-rate arrays and their time bases
+    np.testing.assert_array_equal(data["gyr"], signal["gyr"])
+    np.testing.assert_allclose(data.ts["gyr"], np.arange(100) / 40)
+    np.testing.assert_allclose(data.ts["omc"]["quat"], np.arange(300) / 120)
+
+    # query-time sampling matches resampling
+    ts = np.arange(200) / 100
+    resampled = utils.resample(signal, hz, 100.0, vecinterp_method="cubic")
+    queried = data.at(ts)
+    np.testing.assert_allclose(queried["gyr"], resampled["gyr"][:200])
+    np.testing.assert_allclose(
+        queried["omc"]["marker"], resampled["omc"]["marker"][:200]
+    )
+    np.testing.assert_allclose(queried["omc"]["quat"], resampled["omc"]["quat"][:200])
+
+    # irregular timestamps, outside of the signal the first/last value is used
+    ts = np.array([-1.0, 0.0, 0.0125, 1.234, 100.0])
+    queried_subtree = quatfromangles(np.clip(ts * 120, 0, 299) / 30)
+    np.testing.assert_allclose(data.at(ts)["omc"]["quat"], queried_subtree)
+
+    # scalar timestamps drop the time axis
+    np.testing.assert_allclose(
+        data.at(1.234)["omc"]["quat"], data.at(ts)["omc"]["quat"][3]
+    )
+    assert data.at(0.5)["gyr"].shape == ()
+    assert data.at(0.5)["omc"]["marker"].shape == (3,)
+    assert data.at([0.5])["omc"]["marker"].shape == (1, 3)
+
+    with pytest.raises(AssertionError):
+        data.at(np.zeros((2, 2)))
+
+    # only the queried subtree is evaluated and interpolated
+    data = utils.Timeseries(signal, hz)
+    np.testing.assert_allclose(data.at(ts, "omc", "quat"), queried_subtree)
+    assert list(data._interpolators) == [("omc", "quat")]
+
+    # behaves like the nested dictionary of signals
+    assert isinstance(data, dict) and "gyr" in data
+    assert dict(data.items()) == {"gyr": signal["gyr"], "omc": signal["omc"]}
+    assert tree.flatten(data) == tree.flatten(signal)
+
+    # the sampling rates are lost if the dictionary is re-created
+    with pytest.raises(AssertionError):
+        tree.map_structure(lambda arr: arr, data).at(ts)
@@ -4,7 +4,11 @@ import warnings
 
 import numpy as np
 from qmt import nanInterp
+from qmt import qinv
+from qmt import qmult
+from qmt import quatFromRotVec
 from qmt import quatInterp
+from qmt import quatToRotVec
 from qmt import vecInterp
 from scipy.interpolate import CubicSpline
 import tree
@@ -151,3 +155,111 @@ def _cubic_interpolation(signal: np.ndarray, ts_out: np.ndarray):
     ts_in = np.arange(len(signal))
     interp_1D = lambda arr: (CubicSpline(ts_in, arr)(ts_out))
     return np.array([interp_1D(signal[:, i]) for i in range(signal.shape[1])]).T
+
+
+class Timeseries(dict):
+    """Nested dictionary of signals at their native sampling rates `hz`, i.e.
+    without any resampling.
+
+    `ts` are the time bases (in seconds) of all signals and `at(ts)` evaluates
+    the signals at arbitrary times, using slerp for quaternions and
+    `vecinterp_method` interpolation for vectors. The interpolation
+    coefficients of a signal are computed on its first query and then reused.
+    The sampling rates are lost if the dictionary is re-created, e.g. by
+    `tree.map_structure`.
+    """
+
+    def __init__(
+        self,
+        signal: PyTree,
+        hz: Optional[int | float | PyTree] = None,
+        quatdetect: bool = True,
+        vecinterp_method: str = "cubic",
+    ):
+        if vecinterp_method not in ["linear", "cubic"]:
+            raise NotImplementedError(
+                "`vecinterp_method` must be one of ['linear', 'cubic']"
+            )
+        super().__init__(signal)
+
+        if hz is not None:
+            hz = tree.map_structure(float, hz)
+            if isinstance(hz, float):
+                hz = tree.map_structure(lambda _: hz, dict(self))
+
+        self.hz = hz
+        self.quatdetect = quatdetect
+        self.vecinterp_method = vecinterp_method
+        self._interpolators = {}
+
+    def _assert_hz(self):
+        assert self.hz is not None, "The sampling rates `hz` of the signals are unknown"
+
+    @property
+    def ts(self) -> PyTree:
+        self._assert_hz()
+        return tree.map_structure(
+            lambda arr, hz: np.arange(len(arr)) / hz, dict(self), self.hz
+        )
+
+    def at(self, ts: float | np.ndarray, *keys) -> PyTree:
+        """Evaluate the signals at times `ts` (in seconds). Returns arrays of shape
+        (len(ts), ...) for a 1D `ts` and of shape (...) for a scalar `ts`. With
+        `keys` only that subtree is evaluated, e.g. `data.at(ts, "seg1", "quat")`."""
+        self._assert_hz()
+        ts = np.asarray(ts, dtype=float)
+        assert (
+            ts.ndim <= 1
+        ), f"`ts` must be a scalar or a 1D array, got shape {ts.shape}"
+
+        signal, hz = dict(self), self.hz
+        for key in keys:
+            signal, hz = signal[key], hz[key]
+
+        def evaluate(path, arr, hz):
+            path = tuple(keys) + tuple(path)
+            if path not in self._interpolators:
+                self._interpolators[path] = self._interpolator(arr, hz)
+            out = self._interpolators[path](np.atleast_1d(ts))
+            return out[0] if ts.ndim == 0 else out
+
+        return tree.map_structure_with_path(evaluate, signal, hz)
+
+    def _interpolator(self, signal: np.ndarray, hz: float):
+        is1D = False
+        if signal.ndim == 1:
+            is1D = True
+            signal = signal[:, None]
+        assert signal.ndim == 2
+
+        N = signal.shape[0]
+        signal = nanInterp(signal)
+        if self.quatdetect and signal.shape[1] == 4:
+            interp = _slerp_interpolator(signal)
+        elif self.vecinterp_method == "cubic":
+            interp = CubicSpline(np.arange(N), signal, axis=0)
+        else:
+            interp = lambda ind: vecInterp(signal, ind)
+
+        def f(ts: np.ndarray) -> np.ndarray:
+            # like `quatInterp`, extend the signal by its first/last value
+            out = interp(np.clip(ts * hz, 0, N - 1))
+            return out[:, 0] if is1D else out
+
+        return f
+
+
+def _slerp_interpolator(quat: np.ndarray):
+    # relative rotation between consecutive samples along the shortest path
+    q_rel = qmult(qinv(quat[:-1]), quat[1:])
+    q_rel[q_rel[:, 0] < 0] *= -1
+    rotvec_rel = quatToRotVec(q_rel)
+
+    def interp(ind: np.ndarray) -> np.ndarray:
+        if len(quat) == 1:
+            return np.repeat(quat, len(ind), axis=0)
+        ind0 = np.clip(np.floor(ind).astype(int), 0, len(quat) - 2)
+        frac = (ind - ind0)[:, None]
+        return qmult(quat[ind0], quatFromRotVec(frac * rotvec_rel[ind0]))
+
+    return interp